@@ -2,8 +2,10 @@
 """
 Ashoka API - Simple HTTP service for AI governance advice with multi-persona support
 """
+import hashlib
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 from pathlib import Path
@@ -21,6 +23,9 @@ from persona_manager import PersonaManager
 from realm_tools import REALM_TOOLS, execute_tool
 
 
+_MODULE_DIR = Path(__file__).resolve().parent
+
+
 def log(message):
     """Helper function to print with flush=True for better logging"""
     print(message, flush=True)
@@ -39,10 +44,39 @@ persona_manager = PersonaManager()
 # Model configuration with fallback
 ASHOKA_DEFAULT_MODEL = os.getenv('ASHOKA_DEFAULT_MODEL', 'llama3.2:1b')
 
+# Shared HTTP session for Ollama calls so connections are kept alive across requests
+ollama_session = requests.Session()
+ollama_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+ollama_session.mount('http://', ollama_adapter)
+ollama_session.mount('https://', ollama_adapter)
+
 # Initialize database client and realm status service
 db_client = DatabaseClient()
 realm_status_service = RealmStatusService(db_client)
 
+# Fixed part of the /suggestions prompt; kept ahead of the realm context and history
+SUGGESTIONS_INSTRUCTIONS = """
+Based on the realm status and conversation history below, generate 3 relevant follow-up questions that would be most helpful for this user. The suggestions should:
+1. Be tailored to the current realm's state (size, activity level, extensions)
+2. Address the most relevant governance topics for this realm
+3. Be concise and actionable (under 60 characters each)
+4. Help the user understand or improve their realm's governance
+
+For example:
+- If the realm has low activity, suggest engagement strategies
+- If the realm has no organizations, suggest community structure questions
+- If the realm has extensions, suggest questions about their usage
+- If there's voting activity, suggest participation improvement questions
+
+Format your response as exactly 3 questions, one per line, with no numbering or bullet points.
+"""
+
+# Ollama output for /suggestions keyed on sha256(model + prompt): key -> (expires_at, text)
+SUGGESTIONS_CACHE_TTL_SECONDS = int(os.getenv('SUGGESTIONS_CACHE_TTL_SECONDS', '300'))
+SUGGESTIONS_CACHE_MAX_ENTRIES = 256
+suggestions_cache = {}
+suggestions_cache_lock = threading.Lock()
+
 # In-memory test status storage
 test_jobs = {}
 
@@ -195,22 +229,26 @@ Last Updated: {last_updated}
     context += "\n\n"
     return context
 
-def build_user_context(user_principal, realm_principal):
-    """Build user-specific context"""
+def build_user_context(user_principal, realm_principal, history=None):
+    """Build user-specific context
+    
+    history is the user's recent exchanges if the caller already fetched them.
+    """
     if not user_principal:
         return "\n=== USER CONTEXT ===\nAnonymous user - no historical data available\n\n"
     
     try:
-        history = db_client.get_conversation_history(user_principal, realm_principal)
+        if history is None:
+            history = db_client.get_conversation_history(user_principal, realm_principal, limit=3)
         
         if not history:
             return f"\n=== USER CONTEXT ===\nUser: {user_principal[:8]}...\nFirst-time user - no previous conversations\n\n"
         
-        total_conversations = len(history)
+        total_conversations = db_client.count_conversations(user_principal, realm_principal)
         recent_topics = []
         
         # Analyze recent conversation topics
-        for msg in history[-3:]:
+        for msg in history:
             question = msg['question'].lower()
             if any(word in question for word in ['proposal', 'vote', 'governance']):
                 recent_topics.append('governance')
@@ -234,29 +272,32 @@ def build_user_context(user_principal, realm_principal):
         log(f"Error building user context: {e}")
         return f"\n=== USER CONTEXT ===\nUser: {user_principal[:8]}...\nError loading user history\n\n"
 
-def build_prompt(user_principal, realm_principal, question, realm_status=None, persona_name=None):
-    """Build complete prompt with persona + structured context + history + question"""
+def build_prompt(user_principal, realm_principal, question, realm_status=None, persona_name=None, history=None):
+    """Build complete prompt with persona + structured context + history + question
+    
+    history is the last 3 exchanges if the caller already fetched them.
+    """
     # Get persona content using PersonaManager
     actual_persona_name, persona_content = persona_manager.get_persona_or_default(persona_name)
     # Build structured realm context
     realm_context = build_structured_realm_context(realm_status)
     
-    # Build user context
-    user_context = build_user_context(user_principal, realm_principal)
-    
-    # Get conversation history for context
+    # Last 3 exchanges, shared by the user context and the history section
     history_text = ""
     try:
-        history = db_client.get_conversation_history(user_principal, realm_principal)
-        # Only include last 3 exchanges to keep context manageable
-        recent_history = history[-3:] if len(history) > 3 else history
-        for msg in recent_history:
+        if history is None:
+            history = db_client.get_conversation_history(user_principal, realm_principal, limit=3)
+        for msg in history:
             persona_used = msg.get('persona_name', 'Assistant')
             history_text += f"User: {msg['question']}\n{persona_used.title()}: {msg['response']}\n\n"
     except Exception as e:
         log(f"Error: Could not load conversation history: {e}")
+        history = []
         history_text = ""
     
+    # Build user context
+    user_context = build_user_context(user_principal, realm_principal, history)
+    
     # Complete prompt with structured context
     prompt = f"{persona_content}{realm_context}{user_context}"
     
@@ -375,12 +416,15 @@ def ask():
     # Get actual persona name used (with fallback)
     actual_persona_name, _ = persona_manager.get_persona_or_default(persona_name)
     
-    # If realm_principal is provided but no realm_status, try to fetch from database
+    # Recent history and the stored realm status in one round trip
+    context = db_client.get_context(user_principal, realm_principal, history_limit=3)
+    
+    # If realm_principal is provided but no realm_status, use the one from the database
     log(f"Fetching realm status for {realm_principal}")
     log(f"Realm status: {realm_status}")
     if realm_principal and not realm_status:
         try:
-            realm_status = realm_status_service.get_realm_status_summary(realm_principal)
+            realm_status = realm_status_service.summarize_status(context.get('status'))
             if realm_status:
                 log(f"Retrieved realm status from database for {realm_principal}")
             else:
@@ -403,7 +447,8 @@ def ask():
             realm_status = None
     
     # Build complete prompt with persona and realm context
-    prompt = build_prompt(user_principal, realm_principal, question, realm_status, persona_name)
+    prompt = build_prompt(user_principal, realm_principal, question, realm_status, persona_name,
+                          history=context.get('history'))
     
     # Log the complete prompt for debugging
     log("\n" + "="*80)
@@ -433,7 +478,7 @@ def ask():
             
             # First call - may request tool use
             log("Sending to Ollama with tools...")
-            response = requests.post(f"{ollama_url}/api/chat", json={
+            response = ollama_session.post(f"{ollama_url}/api/chat", json={
                 "model": ASHOKA_DEFAULT_MODEL,
                 "messages": messages,
                 "tools": REALM_TOOLS,
@@ -471,7 +516,7 @@ def ask():
                 
                 # Second call - get final response with tool results
                 log("Sending tool results back to Ollama...")
-                final_response = requests.post(f"{ollama_url}/api/chat", json={
+                final_response = ollama_session.post(f"{ollama_url}/api/chat", json={
                     "model": ASHOKA_DEFAULT_MODEL,
                     "messages": messages,
                     "stream": False
@@ -524,7 +569,7 @@ def stream_response_with_tools(ollama_url, prompt, user_principal, realm_princip
         
         # First call - check if tools are needed (non-streaming)
         log("Checking for tool calls...")
-        response = requests.post(f"{ollama_url}/api/chat", json={
+        response = ollama_session.post(f"{ollama_url}/api/chat", json={
             "model": ASHOKA_DEFAULT_MODEL,
             "messages": messages,
             "tools": REALM_TOOLS,
@@ -558,24 +603,24 @@ def stream_response_with_tools(ollama_url, prompt, user_principal, realm_princip
             
             # Stream the final response with tool results
             log("Streaming final response with tool results...")
-            final_response = requests.post(f"{ollama_url}/api/chat", json={
+            # Use the response as a context manager so the pooled connection is released on early exit
+            with ollama_session.post(f"{ollama_url}/api/chat", json={
                 "model": ASHOKA_DEFAULT_MODEL,
                 "messages": messages,
                 "stream": True
-            }, stream=True)
-            
-            full_answer = ""
-            for line in final_response.iter_lines():
-                if line:
-                    data = json.loads(line.decode('utf-8'))
-                    if 'message' in data and 'content' in data['message']:
-                        chunk = data['message']['content']
-                        full_answer += chunk
-                        yield chunk
-                    
-                    if data.get('done', False):
-                        save_to_conversation(user_principal, realm_principal, question, full_answer, prompt, persona_name)
-                        break
+            }, stream=True) as final_response:
+                full_answer = ""
+                for line in final_response.iter_lines():
+                    if line:
+                        data = json.loads(line.decode('utf-8'))
+                        if 'message' in data and 'content' in data['message']:
+                            chunk = data['message']['content']
+                            full_answer += chunk
+                            yield chunk
+                        
+                        if data.get('done', False):
+                            save_to_conversation(user_principal, realm_principal, question, full_answer, prompt, persona_name)
+                            break
         else:
             # No tool calls - stream directly using chat API
             log("No tools needed, streaming response...")
@@ -587,23 +632,22 @@ def stream_response_with_tools(ollama_url, prompt, user_principal, realm_princip
                 save_to_conversation(user_principal, realm_principal, question, full_answer, prompt, persona_name)
             else:
                 # Stream a new response
-                stream_response = requests.post(f"{ollama_url}/api/chat", json={
+                with ollama_session.post(f"{ollama_url}/api/chat", json={
                     "model": ASHOKA_DEFAULT_MODEL,
                     "messages": messages[:-1],  # Remove empty assistant message
                     "stream": True
-                }, stream=True)
-                
-                for line in stream_response.iter_lines():
-                    if line:
-                        data = json.loads(line.decode('utf-8'))
-                        if 'message' in data and 'content' in data['message']:
-                            chunk = data['message']['content']
-                            full_answer += chunk
-                            yield chunk
-                        
-                        if data.get('done', False):
-                            save_to_conversation(user_principal, realm_principal, question, full_answer, prompt, persona_name)
-                            break
+                }, stream=True) as stream_response:
+                    for line in stream_response.iter_lines():
+                        if line:
+                            data = json.loads(line.decode('utf-8'))
+                            if 'message' in data and 'content' in data['message']:
+                                chunk = data['message']['content']
+                                full_answer += chunk
+                                yield chunk
+                            
+                            if data.get('done', False):
+                                save_to_conversation(user_principal, realm_principal, question, full_answer, prompt, persona_name)
+                                break
                             
     except Exception as e:
         log(f"Error in stream_response_with_tools: {traceback.format_exc()}")
@@ -716,7 +760,7 @@ def test_results(test_id):
     
     # Try to read test_results.json file
     try:
-        results_file = Path(__file__).parent / 'test_results.json'
+        results_file = _MODULE_DIR / 'test_results.json'
         if results_file.exists():
             with open(results_file, 'r') as f:
                 results_data = json.load(f)
@@ -726,6 +770,33 @@ def test_results(test_id):
     except Exception as e:
         return jsonify({'error': f'Failed to read test results: {str(e)}'}), 500
 
+def generate_suggestions_text(ollama_url, prompt):
+    """Generate raw suggestions text with Ollama, cached on the exact model and prompt"""
+    key = hashlib.sha256(f"{ASHOKA_DEFAULT_MODEL}\0{prompt}".encode('utf-8')).hexdigest()
+    now = time.monotonic()
+    with suggestions_cache_lock:
+        cached = suggestions_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    response = ollama_session.post(f"{ollama_url}/api/generate", json={
+        "model": ASHOKA_DEFAULT_MODEL,
+        "prompt": prompt,
+        "stream": False
+    })
+    if response.status_code != 200:
+        raise Exception(f"Ollama API error: {response.status_code}")
+    llm_response = response.json()['response'].strip()
+    
+    with suggestions_cache_lock:
+        if len(suggestions_cache) >= SUGGESTIONS_CACHE_MAX_ENTRIES:
+            for stale_key in [k for k, v in suggestions_cache.items() if v[0] <= now]:
+                del suggestions_cache[stale_key]
+            if len(suggestions_cache) >= SUGGESTIONS_CACHE_MAX_ENTRIES:
+                suggestions_cache.pop(next(iter(suggestions_cache)))
+        suggestions_cache[key] = (now + SUGGESTIONS_CACHE_TTL_SECONDS, llm_response)
+    return llm_response
+
 @app.route('/suggestions', methods=['GET'])
 def get_suggestions():
     """Get contextual chat suggestions based on realm status and conversation history"""
@@ -750,10 +821,9 @@ def get_suggestions():
         # Get conversation history for context
         history_text = ""
         try:
-            history = db_client.get_conversation_history(user_principal, realm_principal)
             # Build conversation history text (last 3 exchanges for context)
-            recent_history = history[-3:] if len(history) > 3 else history
-            for msg in recent_history:
+            history = db_client.get_conversation_history(user_principal, realm_principal, limit=3)
+            for msg in history:
                 persona_used = msg.get('persona_name', 'Assistant')
                 history_text += f"User: {msg['question']}\n{persona_used.title()}: {msg['response']}\n\n"
         except Exception as e:
@@ -766,113 +836,90 @@ def get_suggestions():
         # Get persona content for suggestions
         actual_persona_name, persona_content = persona_manager.get_persona_or_default(persona_name)
         
-        # Create context-aware suggestions based on realm state
-        suggestions_prompt = f"""{persona_content}{realm_context}
+        # Static instructions go ahead of the per-request context so Ollama can reuse the cached prefix
+        suggestions_prompt = f"""{persona_content}{SUGGESTIONS_INSTRUCTIONS}{realm_context}
 
 CONVERSATION_HISTORY:
-{history_text}
-
-Based on the realm status and conversation history above, generate 3 relevant follow-up questions that would be most helpful for this user. The suggestions should:
-1. Be tailored to the current realm's state (size, activity level, extensions)
-2. Address the most relevant governance topics for this realm
-3. Be concise and actionable (under 60 characters each)
-4. Help the user understand or improve their realm's governance
+{history_text}"""
 
-For example:
-- If the realm has low activity, suggest engagement strategies
-- If the realm has no organizations, suggest community structure questions
-- If the realm has extensions, suggest questions about their usage
-- If there's voting activity, suggest participation improvement questions
-
-Format your response as exactly 3 questions, one per line, with no numbering or bullet points:"""
-
-        # Send to Ollama to generate suggestions
-        response = requests.post(f"{ollama_url}/api/generate", json={
-            "model": ASHOKA_DEFAULT_MODEL,
-            "prompt": suggestions_prompt,
-            "stream": False
-        })
+        # Send to Ollama to generate suggestions, reusing the output for an identical recent prompt
+        llm_response = generate_suggestions_text(ollama_url, suggestions_prompt)
         
-        if response.status_code == 200:
-            llm_response = response.json()['response'].strip()
-            
-            # Parse the response into individual suggestions
-            suggestions = []
-            lines = llm_response.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#') and not line.startswith('-') and not line.startswith('*'):
-                    # Clean up any numbering or formatting
-                    cleaned_line = line
-                    # Remove common prefixes like "1.", "2.", etc.
-                    import re
-                    cleaned_line = re.sub(r'^\d+\.\s*', '', cleaned_line)
-                    cleaned_line = re.sub(r'^[-*]\s*', '', cleaned_line)
-                    
-                    if cleaned_line:
-                        suggestions.append(cleaned_line)
+        # Parse the response into individual suggestions
+        suggestions = []
+        lines = llm_response.split('\n')
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith('#') and not line.startswith('-') and not line.startswith('*'):
+                # Clean up any numbering or formatting
+                cleaned_line = line
+                # Remove common prefixes like "1.", "2.", etc.
+                import re
+                cleaned_line = re.sub(r'^\d+\.\s*', '', cleaned_line)
+                cleaned_line = re.sub(r'^[-*]\s*', '', cleaned_line)
+                
+                if cleaned_line:
+                    suggestions.append(cleaned_line)
+        
+        # Ensure we have exactly 3 suggestions with smart fallbacks
+        if len(suggestions) < 3:
+            # Context-aware fallback suggestions based on realm status
+            fallback_suggestions = []
             
-            # Ensure we have exactly 3 suggestions with smart fallbacks
-            if len(suggestions) < 3:
-                # Context-aware fallback suggestions based on realm status
-                fallback_suggestions = []
+            if realm_status:
+                status_data = realm_status.get('status_data', {})
+                users_count = status_data.get('users_count', 0)
+                organizations_count = status_data.get('organizations_count', 0)
+                proposals_count = status_data.get('proposals_count', 0)
+                extensions = status_data.get('extensions', [])
                 
-                if realm_status:
-                    status_data = realm_status.get('status_data', {})
-                    users_count = status_data.get('users_count', 0)
-                    organizations_count = status_data.get('organizations_count', 0)
-                    proposals_count = status_data.get('proposals_count', 0)
-                    extensions = status_data.get('extensions', [])
-                    
-                    if users_count == 0:
-                        fallback_suggestions = [
-                            "How do I invite users to this realm?",
-                            "What are the first steps to set up governance?",
-                            "How do I configure realm settings?"
-                        ]
-                    elif organizations_count == 0:
-                        fallback_suggestions = [
-                            "How do I create organizations in this realm?",
-                            "What governance structure should we adopt?",
-                            "How do we encourage community participation?"
-                        ]
-                    elif proposals_count == 0:
-                        fallback_suggestions = [
-                            "How do I create the first proposal?",
-                            "What topics should we vote on first?",
-                            "How do we increase voting participation?"
-                        ]
-                    elif len(extensions) == 0:
-                        fallback_suggestions = [
-                            "What extensions should we install?",
-                            "How do extensions improve governance?",
-                            "What features are missing in our realm?"
-                        ]
-                    else:
-                        fallback_suggestions = [
-                            "How can we improve our governance health score?",
-                            "What governance best practices should we adopt?",
-                            "How do we measure our realm's success?"
-                        ]
+                if users_count == 0:
+                    fallback_suggestions = [
+                        "How do I invite users to this realm?",
+                        "What are the first steps to set up governance?",
+                        "How do I configure realm settings?"
+                    ]
+                elif organizations_count == 0:
+                    fallback_suggestions = [
+                        "How do I create organizations in this realm?",
+                        "What governance structure should we adopt?",
+                        "How do we encourage community participation?"
+                    ]
+                elif proposals_count == 0:
+                    fallback_suggestions = [
+                        "How do I create the first proposal?",
+                        "What topics should we vote on first?",
+                        "How do we increase voting participation?"
+                    ]
+                elif len(extensions) == 0:
+                    fallback_suggestions = [
+                        "What extensions should we install?",
+                        "How do extensions improve governance?",
+                        "What features are missing in our realm?"
+                    ]
                 else:
                     fallback_suggestions = [
-                        "What is a realm?",
-                        "How does decentralized governance work?",
-                        "What can an AI governance assistant do?"
+                        "How can we improve our governance health score?",
+                        "What governance best practices should we adopt?",
+                        "How do we measure our realm's success?"
                     ]
-                
-                suggestions.extend(fallback_suggestions[len(suggestions):3])
-            elif len(suggestions) > 3:
-                suggestions = suggestions[:3]
-            
-            log(f"Generated contextual suggestions: {suggestions}")
+            else:
+                fallback_suggestions = [
+                    "What is a realm?",
+                    "How does decentralized governance work?",
+                    "What can an AI governance assistant do?"
+                ]
             
-            return jsonify({
-                "suggestions": suggestions,
-                "persona_used": actual_persona_name
-            })
-        else:
-            raise Exception(f"Ollama API error: {response.status_code}")
+            suggestions.extend(fallback_suggestions[len(suggestions):3])
+        elif len(suggestions) > 3:
+            suggestions = suggestions[:3]
+        
+        log(f"Generated contextual suggestions: {suggestions}")
+        
+        return jsonify({
+            "suggestions": suggestions,
+            "persona_used": actual_persona_name
+        })
             
     except Exception as e:
         log(f"Error generating contextual suggestions: {e}")
@@ -4,11 +4,9 @@ Ashoka CLI - Command line interface for interacting with the Ashoka API
 """
 import argparse
 import json
-import requests
 import sys
 import os
 from pathlib import Path
-import time
 from typing import Optional, Dict, Any
 import traceback
 
@@ -16,11 +14,14 @@ class AshokaClient:
     """Client for interacting with Ashoka API"""
     
     def __init__(self, base_url: str = "http://localhost:5000"):
+        # Imported here so argument errors and --help don't pay for loading requests
+        import requests
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
     
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Make HTTP request to API"""
+        import requests
         url = f"{self.base_url}{endpoint}"
         
         try:
@@ -1,203 +1,634 @@
+import csv
+import io
 import json
 import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import Dict, List, Optional
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection as _PgConnection
+from psycopg2.extras import Json, RealDictCursor, execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from typing import Dict, Iterable, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Connection settings; the defaults match the database run.sh and the Dockerfile create
+DB_HOST = os.getenv('DB_HOST', 'localhost')
+DB_PORT = os.getenv('DB_PORT', '5432')
+DB_NAME = os.getenv('DB_NAME', 'ashoka_db')
+DB_USER = os.getenv('DB_USER', 'ashoka_user')
+DB_PASSWORD = os.getenv('DB_PASSWORD', 'ashoka_pass')
+
+# Connection pool bounds. Idle connections above the minimum are closed when
+# returned, so the minimum defaults to the maximum to keep them (and their
+# PREPAREd statements) alive.
+POOL_MAX_CONN = int(os.getenv('DB_POOL_MAX_CONN', '10'))
+POOL_MIN_CONN = min(int(os.getenv('DB_POOL_MIN_CONN', str(POOL_MAX_CONN))), POOL_MAX_CONN)
+# Seconds a caller waits for a free connection before giving up
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+
+# Rows fetched per round trip by the server-side cursors behind the iter_* methods
+ITER_SIZE = 500
+
+# Short-lived read caches: latest status per realm, and the liveness probe result
+LATEST_STATUS_CACHE_TTL = float(os.getenv('DB_LATEST_STATUS_CACHE_TTL', '2.0'))
+LATEST_STATUS_CACHE_SIZE = 1024
+HEALTH_CHECK_CACHE_TTL = 1.0
+# health_check trusts local connection state only this soon after a successful query
+HEALTH_CHECK_RECENT_QUERY = 5.0
+
+# Writes to realm_status within this window share one refresh of realm_status_latest
+LATEST_VIEW_REFRESH_DELAY = float(os.getenv('DB_LATEST_VIEW_REFRESH_DELAY', '1.0'))
+
+# Explicit column lists for the prepared SELECTs: a prepared SELECT * pins its
+# result type, so any ALTER TABLE would break every pooled connection with
+# "cached plan must not change result type"
+CONVERSATION_COLUMNS = ("id, user_principal, realm_principal, question, response, "
+                        "persona_name, prompt_context, metadata, created_at")
+REALM_STATUS_COLUMNS = "id, realm_principal, realm_url, status_data, created_at"
+
+# Hot statements, PREPAREd once on each pooled connection and run with EXECUTE
+PREPARED_STATEMENTS = {
+    'store_conversation': """
+        INSERT INTO conversations (user_principal, realm_principal, question, response, persona_name, prompt_context, metadata)
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        RETURNING id
+    """,
+    'get_conversation': f"SELECT {CONVERSATION_COLUMNS} FROM conversations WHERE id = $1",
+    # Newest $4 rows after $3 (NULL = no lower bound), returned oldest first
+    'get_conversation_history': """
+        SELECT question, response, persona_name FROM (
+            SELECT question, response, persona_name, created_at FROM conversations 
+            WHERE user_principal = $1 AND realm_principal = $2 
+            AND ($3::timestamp IS NULL OR created_at > $3::timestamp)
+            ORDER BY created_at DESC 
+            LIMIT $4
+        ) recent
+        ORDER BY created_at ASC
+    """,
+    'get_conversation_history_by_persona': """
+        SELECT question, response, persona_name FROM (
+            SELECT question, response, persona_name, created_at FROM conversations 
+            WHERE user_principal = $1 AND realm_principal = $2 AND persona_name = $5
+            AND ($3::timestamp IS NULL OR created_at > $3::timestamp)
+            ORDER BY created_at DESC 
+            LIMIT $4
+        ) recent
+        ORDER BY created_at ASC
+    """,
+    'store_realm_status': """
+        INSERT INTO realm_status (realm_principal, realm_url, status_data)
+        VALUES ($1, $2, $3)
+        RETURNING id
+    """,
+    'get_latest_realm_status': f"""
+        SELECT {REALM_STATUS_COLUMNS} FROM realm_status 
+        WHERE realm_principal = $1 
+        ORDER BY created_at DESC 
+        LIMIT 1
+    """,
+}
+
+# Reads the realm_status_latest view; PREPAREd on first use rather than with the
+# statements above, so a missing view only breaks this query
+LATEST_VIEW_STATEMENT = f"SELECT {REALM_STATUS_COLUMNS} FROM realm_status_latest ORDER BY realm_principal"
+
+# psycopg2 decodes JSONB columns (metadata, status_data) to Python objects on read;
+# writes go through the Json adapter
+
+class _CsvRowStream(io.TextIOBase):
+    """Read-only file object that renders rows as CSV lazily, for COPY ... FROM STDIN"""
+    
+    def __init__(self, rows: Iterable[tuple]):
+        self._lines = self._csv_lines(rows)
+        self._buffer = ''
+    
+    @staticmethod
+    def _csv_lines(rows: Iterable[tuple]) -> Iterator[str]:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        for row in rows:
+            writer.writerow(row)
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+    
+    def readable(self) -> bool:
+        return True
+    
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+class _PooledConnection(_PgConnection):
+    """psycopg2 connection that remembers which statements were PREPAREd on it"""
+    
+    prepared = False
+    prepared_latest_view = False
+    # time.monotonic() when a block using this connection last completed without error
+    last_success = 0.0
+
+
 class DatabaseClient:
     def __init__(self):
-        self.connection = None
+        self.pool = None
+        # realm_principal -> (expires_at, row); health check -> (expires_at, healthy)
+        self._latest_status_cache = {}
+        # Bumped on every invalidation so a read that raced a write doesn't cache its stale row
+        self._latest_status_generation = 0
+        self._health_check_cache = None
+        self._cache_lock = threading.Lock()
+        self._refresh_timer = None
+        # Set by writes, cleared just before each refresh of realm_status_latest;
+        # _refresh_scheduled is true while the timer thread owns the refreshes
+        self._refresh_pending = False
+        self._refresh_scheduled = False
+        # ThreadedConnectionPool raises as soon as it is exhausted; borrowers
+        # queue on this instead (iter_* generators hold a slot until closed)
+        self._pool_slots = threading.BoundedSemaphore(POOL_MAX_CONN)
         self.connect()
     
     def connect(self):
         try:
-            self.connection = psycopg2.connect(
-                host='localhost',
-                database='ashoka_db',
-                user='ashoka_user',
-                password='ashoka_pass',
-                port='5432'
+            self.pool = ThreadedConnectionPool(
+                POOL_MIN_CONN,
+                POOL_MAX_CONN,
+                host=DB_HOST,
+                database=DB_NAME,
+                user=DB_USER,
+                password=DB_PASSWORD,
+                port=DB_PORT,
+                connection_factory=_PooledConnection
             )
             logger.info("Connected to PostgreSQL database")
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
             raise
     
+    @contextmanager
+    def _connection(self, track_success: bool = True):
+        """Borrow a connection from the pool for the duration of the block
+        
+        Waits up to DB_POOL_TIMEOUT seconds for a free connection, then raises
+        PoolError. track_success=False leaves conn.last_success alone, for
+        blocks that do not actually query the server.
+        """
+        if not self._pool_slots.acquire(timeout=POOL_TIMEOUT):
+            raise PoolError(f"connection pool exhausted: no connection free after {POOL_TIMEOUT}s")
+        try:
+            conn = self.pool.getconn()
+        except Exception:
+            self._pool_slots.release()
+            raise
+        try:
+            self._prepare(conn)
+            yield conn
+            if track_success:
+                conn.last_success = time.monotonic()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            try:
+                # The pool rolls back any transaction still open on return
+                self.pool.putconn(conn)
+            finally:
+                self._pool_slots.release()
+    
+    def _prepare(self, conn):
+        """PREPARE the hot statements the first time a pooled connection is handed out"""
+        if conn.prepared:
+            return
+        with conn.cursor() as cursor:
+            for name, sql in PREPARED_STATEMENTS.items():
+                cursor.execute(f"PREPARE {name} AS {sql}")
+        conn.commit()
+        conn.prepared = True
+    
     def store_conversation(self, user_principal: str, realm_principal: str, 
                           question: str, response: str, prompt_context: str = None,
                           metadata: Dict = None, persona_name: str = 'ashoka') -> int:
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO conversations (user_principal, realm_principal, question, response, persona_name, prompt_context, metadata)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (user_principal, realm_principal, question, response, persona_name, prompt_context, json.dumps(metadata) if metadata else None))
+            with self._connection() as conn, conn.cursor() as cursor:
+                cursor.execute("EXECUTE store_conversation (%s, %s, %s, %s, %s, %s, %s)", (user_principal, realm_principal, question, response, persona_name, prompt_context, Json(metadata) if metadata else None))
                 
                 conversation_id = cursor.fetchone()[0]
-                self.connection.commit()
-                logger.info(f"Stored conversation with ID: {conversation_id} using persona: {persona_name}")
+                conn.commit()
+                logger.info("Stored conversation with ID: %s using persona: %s", conversation_id, persona_name)
                 return conversation_id
         except Exception as e:
             logger.error(f"Failed to store conversation: {e}")
-            self.connection.rollback()
+            raise
+    
+    def store_conversations_bulk(self, conversations: List[Dict]) -> List[int]:
+        """Store many conversations with a single multi-row INSERT
+        
+        Each item takes the same keys as store_conversation's arguments.
+        """
+        if not conversations:
+            return []
+        try:
+            rows = [
+                (c['user_principal'], c['realm_principal'], c['question'], c['response'],
+                 c.get('persona_name', 'ashoka'), c.get('prompt_context'),
+                 Json(c['metadata']) if c.get('metadata') else None)
+                for c in conversations
+            ]
+            with self._connection() as conn, conn.cursor() as cursor:
+                ids = execute_values(cursor, """
+                    INSERT INTO conversations (user_principal, realm_principal, question, response, persona_name, prompt_context, metadata)
+                    VALUES %s
+                    RETURNING id
+                """, rows, page_size=500, fetch=True)
+                
+                conn.commit()
+                logger.info("Stored %d conversations", len(ids))
+                return [row[0] for row in ids]
+        except Exception as e:
+            logger.error(f"Failed to store conversations: {e}")
+            raise
+    
+    def bulk_load_conversations(self, conversations: Iterable[Dict]) -> int:
+        """Backfill conversations with a single COPY, streaming rows from any iterable
+        
+        Each item takes the same keys as store_conversation's arguments. Returns
+        the number of rows loaded; ids are not returned, use
+        store_conversations_bulk when they are needed.
+        """
+        rows = (
+            (c['user_principal'], c['realm_principal'], c['question'], c['response'],
+             c.get('persona_name', 'ashoka'), c.get('prompt_context'),
+             json.dumps(c['metadata']) if c.get('metadata') else None)
+            for c in conversations
+        )
+        try:
+            with self._connection() as conn, conn.cursor() as cursor:
+                # Unquoted empty fields are NULL in CSV COPY; keep them as '' for NOT NULL text columns
+                cursor.copy_expert("""
+                    COPY conversations (user_principal, realm_principal, question, response, persona_name, prompt_context, metadata)
+                    FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (user_principal, realm_principal, question, response, persona_name))
+                """, _CsvRowStream(rows))
+                
+                loaded = cursor.rowcount
+                conn.commit()
+                logger.info("Bulk loaded %d conversations", loaded)
+                return loaded
+        except Exception as e:
+            logger.error(f"Failed to bulk load conversations: {e}")
             raise
     
     def get_conversation(self, conversation_id: int) -> Optional[Dict]:
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("SELECT * FROM conversations WHERE id = %s", (conversation_id,))
-                result = cursor.fetchone()
-                if result:
-                    result = dict(result)
-                    if result['metadata']:
-                        result['metadata'] = json.loads(result['metadata'])
-                return result
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("EXECUTE get_conversation (%s)", (conversation_id,))
+                return cursor.fetchone()
         except Exception as e:
             logger.error(f"Failed to get conversation: {e}")
             return None
     
+    def iter_conversations_by_user(self, user_principal: str, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Yield a user's conversations newest first, streamed from a server-side cursor
+        
+        limit=None walks the whole history. The pooled connection is held until
+        the generator is exhausted or closed.
+        """
+        with self._connection() as conn, \
+                conn.cursor(name='conversations_by_user', cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = ITER_SIZE
+            cursor.execute("""
+                SELECT * FROM conversations 
+                WHERE user_principal = %s 
+                ORDER BY created_at DESC 
+                LIMIT %s
+            """, (user_principal, limit))
+            
+            for row in cursor:
+                yield row
+    
     def get_conversations_by_user(self, user_principal: str, limit: int = 10) -> List[Dict]:
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("""
-                    SELECT * FROM conversations 
-                    WHERE user_principal = %s 
-                    ORDER BY created_at DESC 
-                    LIMIT %s
-                """, (user_principal, limit))
-                
-                results = []
-                for row in cursor.fetchall():
-                    result = dict(row)
-                    if result['metadata']:
-                        result['metadata'] = json.loads(result['metadata'])
-                    results.append(result)
-                return results
+            return list(self.iter_conversations_by_user(user_principal, limit))
         except Exception as e:
             logger.error(f"Failed to get conversations by user: {e}")
             return []
     
-    def get_conversation_history(self, user_principal: str, realm_principal: str, persona_name: str = None) -> List[Dict]:
-        """Get conversation history for a specific user+realm pair, optionally filtered by persona"""
+    def get_conversation_history(self, user_principal: str, realm_principal: str, persona_name: str = None,
+                                 since: Optional[datetime] = None, limit: int = 1000) -> List[Dict]:
+        """Get conversation history for a specific user+realm pair, optionally filtered by persona
+        
+        Returns the most recent `limit` exchanges newer than `since`, oldest first.
+        """
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 if persona_name:
-                    cursor.execute("""
-                        SELECT question, response, persona_name FROM conversations 
-                        WHERE user_principal = %s AND realm_principal = %s AND persona_name = %s
-                        ORDER BY created_at ASC
-                    """, (user_principal, realm_principal, persona_name))
+                    cursor.execute("EXECUTE get_conversation_history_by_persona (%s, %s, %s, %s, %s)",
+                                   (user_principal, realm_principal, since, limit, persona_name))
                 else:
-                    cursor.execute("""
-                        SELECT question, response, persona_name FROM conversations 
-                        WHERE user_principal = %s AND realm_principal = %s 
-                        ORDER BY created_at ASC
-                    """, (user_principal, realm_principal))
+                    cursor.execute("EXECUTE get_conversation_history (%s, %s, %s, %s)",
+                                   (user_principal, realm_principal, since, limit))
                 
-                return [dict(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"Failed to get conversation history: {e}")
             return []
     
+    def count_conversations(self, user_principal: str, realm_principal: str) -> int:
+        """Count all conversations for a specific user+realm pair"""
+        try:
+            with self._connection() as conn, conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT COUNT(*) FROM conversations 
+                    WHERE user_principal = %s AND realm_principal = %s
+                """, (user_principal, realm_principal))
+                
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Failed to count conversations: {e}")
+            return 0
+    
+    def get_context(self, user_principal: str, realm_principal: str, history_limit: int = 3) -> Dict:
+        """Get recent conversation history and the latest realm status in one round trip
+        
+        Returns {'history': [...], 'status': {...} or None}, or {} on error.
+        History holds the newest `history_limit` exchanges, oldest first. status
+        is the row as JSON, so created_at comes back as an ISO string.
+        """
+        try:
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    WITH h AS (
+                        SELECT question, response, persona_name, created_at FROM conversations 
+                        WHERE user_principal = %(user)s AND realm_principal = %(realm)s 
+                        ORDER BY created_at DESC 
+                        LIMIT %(limit)s
+                    ), s AS (
+                        SELECT * FROM realm_status 
+                        WHERE realm_principal = %(realm)s 
+                        ORDER BY created_at DESC 
+                        LIMIT 1
+                    )
+                    SELECT
+                        (SELECT COALESCE(json_agg(json_build_object(
+                                    'question', question, 'response', response, 'persona_name', persona_name
+                                ) ORDER BY created_at), '[]'::json)
+                         FROM h) AS history,
+                        (SELECT row_to_json(s) FROM s) AS status
+                """, {'user': user_principal, 'realm': realm_principal, 'limit': history_limit})
+                
+                return cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Failed to get context: {e}")
+            return {}
+    
     def store_realm_status(self, realm_principal: str, realm_url: str, status_data: Dict) -> int:
         """Store realm status data in the database as JSON blob"""
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO realm_status (realm_principal, realm_url, status_data)
-                    VALUES (%s, %s, %s)
-                    RETURNING id
-                """, (realm_principal, realm_url, json.dumps(status_data)))
+            with self._connection() as conn, conn.cursor() as cursor:
+                cursor.execute("EXECUTE store_realm_status (%s, %s, %s)",
+                               (realm_principal, realm_url, Json(status_data)))
                 
                 status_id = cursor.fetchone()[0]
-                self.connection.commit()
-                logger.info(f"Stored realm status with ID: {status_id}")
-                return status_id
+                conn.commit()
+            self._invalidate_latest_status(realm_principal)
+            self._schedule_latest_view_refresh()
+            logger.info("Stored realm status with ID: %s", status_id)
+            return status_id
         except Exception as e:
             logger.error(f"Failed to store realm status: {e}")
-            self.connection.rollback()
             raise
 
+    def store_realm_statuses_bulk(self, statuses: List[Dict]) -> List[int]:
+        """Store many realm status snapshots with a single multi-row INSERT
+        
+        Each item needs 'realm_principal', 'realm_url' and 'status_data' keys.
+        """
+        if not statuses:
+            return []
+        try:
+            rows = [(s['realm_principal'], s['realm_url'], Json(s['status_data'])) for s in statuses]
+            with self._connection() as conn, conn.cursor() as cursor:
+                ids = execute_values(cursor, """
+                    INSERT INTO realm_status (realm_principal, realm_url, status_data)
+                    VALUES %s
+                    RETURNING id
+                """, rows, page_size=500, fetch=True)
+                
+                conn.commit()
+            for s in statuses:
+                self._invalidate_latest_status(s['realm_principal'])
+            self._schedule_latest_view_refresh()
+            logger.info("Stored %d realm statuses", len(ids))
+            return [row[0] for row in ids]
+        except Exception as e:
+            logger.error(f"Failed to store realm statuses: {e}")
+            raise
+
+    def _schedule_latest_view_refresh(self):
+        """Refresh realm_status_latest shortly after a write, coalescing bursts of writes"""
+        with self._cache_lock:
+            self._refresh_pending = True
+            if self._refresh_scheduled:
+                # The timer thread re-checks the flag after each refresh
+                return
+            self._refresh_scheduled = True
+            self._refresh_timer = threading.Timer(LATEST_VIEW_REFRESH_DELAY, self._run_pending_refreshes)
+            self._refresh_timer.daemon = True
+            self._refresh_timer.start()
+
+    def _run_pending_refreshes(self):
+        """Refresh until no write has landed since the last refresh started"""
+        while True:
+            with self._cache_lock:
+                if not self._refresh_pending:
+                    self._refresh_scheduled = False
+                    return
+                self._refresh_pending = False
+            self.refresh_latest_status_view()
+
+    def refresh_latest_status_view(self):
+        """Rebuild realm_status_latest without blocking readers"""
+        try:
+            with self._connection() as conn, conn.cursor() as cursor:
+                cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY realm_status_latest")
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to refresh realm_status_latest: {e}")
+
+    def _invalidate_latest_status(self, realm_principal: str):
+        with self._cache_lock:
+            self._latest_status_cache.pop(realm_principal, None)
+            self._latest_status_generation += 1
+
     def get_latest_realm_status(self, realm_principal: str) -> Optional[Dict]:
-        """Get the latest status for a specific realm"""
+        """Get the latest status for a specific realm
+        
+        Served from a short TTL cache; storing a new status for the realm
+        invalidates its entry. Each call gets its own (shallow) copy of the row.
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._latest_status_cache.get(realm_principal)
+            generation = self._latest_status_generation
+        if cached and cached[0] > now:
+            return dict(cached[1]) if cached[1] else None
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("""
-                    SELECT * FROM realm_status 
-                    WHERE realm_principal = %s 
-                    ORDER BY created_at DESC 
-                    LIMIT 1
-                """, (realm_principal,))
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("EXECUTE get_latest_realm_status (%s)", (realm_principal,))
                 
                 result = cursor.fetchone()
-                if result:
-                    result = dict(result)
-                    if result['status_data']:
-                        # Handle case where status_data might already be a dict or need JSON parsing
-                        if isinstance(result['status_data'], str):
-                            result['status_data'] = json.loads(result['status_data'])
-                        # If it's already a dict, leave it as is
-                return result
+            result = dict(result) if result else None
+            with self._cache_lock:
+                if generation != self._latest_status_generation:
+                    # A store landed while we were reading; this row may predate it
+                    return result
+                if len(self._latest_status_cache) >= LATEST_STATUS_CACHE_SIZE:
+                    self._latest_status_cache = {
+                        k: v for k, v in self._latest_status_cache.items() if v[0] > now
+                    }
+                    if len(self._latest_status_cache) >= LATEST_STATUS_CACHE_SIZE:
+                        self._latest_status_cache.clear()
+                self._latest_status_cache[realm_principal] = (now + LATEST_STATUS_CACHE_TTL, result)
+            return dict(result) if result else None
         except Exception as e:
             logger.error(f"Failed to get latest realm status: {e}")
             return None
 
-    def get_realm_status_history(self, realm_principal: str, limit: int = 10) -> List[Dict]:
-        """Get status history for a specific realm"""
+    def iter_realm_status_history(self, realm_principal: str, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Yield a realm's status snapshots newest first, streamed from a server-side cursor
+        
+        limit=None walks the whole history. The pooled connection is held until
+        the generator is exhausted or closed.
+        """
+        with self._connection() as conn, \
+                conn.cursor(name='realm_status_history', cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = ITER_SIZE
+            cursor.execute("""
+                SELECT * FROM realm_status 
+                WHERE realm_principal = %s 
+                ORDER BY created_at DESC 
+                LIMIT %s
+            """, (realm_principal, limit))
+            
+            for row in cursor:
+                yield row
+
+    def get_latest_realm_statuses(self, realm_principals: List[str]) -> Dict[str, Dict]:
+        """Get the latest status for several realms in one round trip
+        
+        Returns {realm_principal: row}; realms with no status are left out.
+        """
+        if not realm_principals:
+            return {}
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute("""
-                    SELECT * FROM realm_status 
+                    SELECT r.*
+                    FROM unnest(%s::text[]) AS p(realm_principal),
+                    LATERAL (
+                        SELECT * FROM realm_status 
+                        WHERE realm_principal = p.realm_principal 
+                        ORDER BY created_at DESC 
+                        LIMIT 1
+                    ) r
+                """, (list(set(realm_principals)),))
+                
+                return {row['realm_principal']: row for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Failed to get latest realm statuses: {e}")
+            return {}
+
+    def get_realm_status_fields(self, realm_principal: str, fields: List[str]) -> Optional[Dict]:
+        """Get selected parts of a realm's latest status_data without fetching the whole blob
+        
+        Fields are dotted paths into status_data (e.g. 'data.status.users_count').
+        Returns {field: value}, with None for paths that do not exist, or None
+        if the realm has no status.
+        """
+        if not fields:
+            return {}
+        try:
+            with self._connection() as conn, conn.cursor() as cursor:
+                columns = ", ".join(["status_data #> %s"] * len(fields))
+                cursor.execute(f"""
+                    SELECT {columns} FROM realm_status 
                     WHERE realm_principal = %s 
                     ORDER BY created_at DESC 
-                    LIMIT %s
-                """, (realm_principal, limit))
+                    LIMIT 1
+                """, [field.split('.') for field in fields] + [realm_principal])
                 
-                results = []
-                for row in cursor.fetchall():
-                    result = dict(row)
-                    if result['status_data']:
-                        # Handle case where status_data might already be a dict or need JSON parsing
-                        if isinstance(result['status_data'], str):
-                            result['status_data'] = json.loads(result['status_data'])
-                        # If it's already a dict, leave it as is
-                    results.append(result)
-                return results
+                row = cursor.fetchone()
+                return dict(zip(fields, row)) if row else None
+        except Exception as e:
+            logger.error(f"Failed to get realm status fields: {e}")
+            return None
+
+    def get_realm_status_history(self, realm_principal: str, limit: int = 10) -> List[Dict]:
+        """Get status history for a specific realm"""
+        try:
+            return list(self.iter_realm_status_history(realm_principal, limit))
         except Exception as e:
             logger.error(f"Failed to get realm status history: {e}")
             return []
 
     def get_all_realms_latest_status(self) -> List[Dict]:
-        """Get latest status for all tracked realms"""
+        """Get latest status for all tracked realms
+        
+        Reads the realm_status_latest materialized view, which is refreshed
+        about DB_LATEST_VIEW_REFRESH_DELAY seconds after each write.
+        """
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("""
-                    SELECT DISTINCT ON (realm_principal) *
-                    FROM realm_status 
-                    ORDER BY realm_principal, created_at DESC
-                """)
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                if not conn.prepared_latest_view:
+                    cursor.execute(f"PREPARE get_all_realms_latest_status AS {LATEST_VIEW_STATEMENT}")
+                    conn.prepared_latest_view = True
+                cursor.execute("EXECUTE get_all_realms_latest_status")
                 
-                results = []
-                for row in cursor.fetchall():
-                    result = dict(row)
-                    if result['status_data']:
-                        # Handle case where status_data might already be a dict or need JSON parsing
-                        if isinstance(result['status_data'], str):
-                            result['status_data'] = json.loads(result['status_data'])
-                        # If it's already a dict, leave it as is
-                    results.append(result)
-                return results
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"Failed to get all realms latest status: {e}")
             return []
 
     def health_check(self) -> bool:
+        """Cheap liveness check, answered from local connection state when possible
+        
+        Falls back to a SELECT 1 round trip when the pooled connection has not
+        completed a query in the last HEALTH_CHECK_RECENT_QUERY seconds.
+        """
+        now = time.monotonic()
+        cached = self._health_check_cache
+        if cached and cached[0] > now:
+            return cached[1]
+        try:
+            with self._connection(track_success=False) as conn:
+                healthy = (not conn.closed
+                           and conn.get_transaction_status() == TRANSACTION_STATUS_IDLE)
+                if healthy and now - conn.last_success > HEALTH_CHECK_RECENT_QUERY:
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    conn.rollback()
+                    conn.last_success = time.monotonic()
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            healthy = False
+        self._health_check_cache = (now + HEALTH_CHECK_CACHE_TTL, healthy)
+        return healthy
+    
+    def deep_health_check(self) -> bool:
+        """Round-trip health check for admin endpoints"""
         try:
-            with self.connection.cursor() as cursor:
+            with self._connection() as conn, conn.cursor() as cursor:
                 cursor.execute("SELECT 1")
                 return True
         except Exception as e:
@@ -207,7 +638,7 @@ class DatabaseClient:
     def get_persona_usage_stats(self, realm_principal: str = None, days: int = 30) -> List[Dict]:
         """Get statistics on persona usage over the specified time period"""
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 if realm_principal:
                     cursor.execute("""
                         SELECT 
@@ -237,7 +668,7 @@ class DatabaseClient:
                         ORDER BY usage_count DESC
                     """, (days,))
                 
-                return [dict(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"Failed to get persona usage stats: {e}")
             return []
@@ -245,7 +676,7 @@ class DatabaseClient:
     def get_conversations_by_persona(self, persona_name: str, limit: int = 10) -> List[Dict]:
         """Get recent conversations for a specific persona"""
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute("""
                     SELECT * FROM conversations 
                     WHERE persona_name = %s 
@@ -253,18 +684,17 @@ class DatabaseClient:
                     LIMIT %s
                 """, (persona_name, limit))
                 
-                results = []
-                for row in cursor.fetchall():
-                    result = dict(row)
-                    if result['metadata']:
-                        result['metadata'] = json.loads(result['metadata'])
-                    results.append(result)
-                return results
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"Failed to get conversations by persona: {e}")
             return []
     
     def close(self):
-        if self.connection:
-            self.connection.close()
+        if self._refresh_timer:
+            # Let a running refresh finish, then flush the last writes synchronously
+            self._refresh_timer.cancel()
+            self._refresh_timer.join()
+            self._run_pending_refreshes()
+        if self.pool:
+            self.pool.closeall()
             logger.info("Database connection closed")
@@ -21,8 +21,21 @@ CREATE TABLE IF NOT EXISTS realm_status (
 -- Indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_conversations_persona_name ON conversations(persona_name);
 CREATE INDEX IF NOT EXISTS idx_conversations_user_realm_persona ON conversations(user_principal, realm_principal, persona_name);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_ct ON conversations(user_principal, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_realm_status_rp_ct ON realm_status(realm_principal, created_at DESC);
+-- conversations is append-only, so a BRIN index covers created_at range scans at a fraction of a btree's size
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_conv_created_brin ON conversations USING BRIN (created_at);
+
+-- Latest snapshot per realm, refreshed by DatabaseClient after writes.
+-- REFRESH ... CONCURRENTLY needs the unique index, and only the owner may refresh.
+CREATE MATERIALIZED VIEW IF NOT EXISTS realm_status_latest AS
+    SELECT DISTINCT ON (realm_principal) *
+    FROM realm_status
+    ORDER BY realm_principal, created_at DESC;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_realm_status_latest_rp ON realm_status_latest(realm_principal);
 
 GRANT ALL PRIVILEGES ON TABLE conversations TO ashoka_user;
 GRANT USAGE, SELECT ON SEQUENCE conversations_id_seq TO ashoka_user;
 GRANT ALL PRIVILEGES ON TABLE realm_status TO ashoka_user;
 GRANT USAGE, SELECT ON SEQUENCE realm_status_id_seq TO ashoka_user;
+ALTER MATERIALIZED VIEW realm_status_latest OWNER TO ashoka_user;
@@ -3,16 +3,23 @@
 PersonaManager - Manages AI personas for the Ashoka governance assistant
 """
 import os
+import re
 from pathlib import Path
 
+_MODULE_DIR = Path(__file__).resolve().parent
+
+# Persona names become file names under prompts/personas; use fullmatch, since
+# a $-anchored match would also accept a trailing newline
+VALID_PERSONA_NAME = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
 
 class PersonaManager:
     """Manages different AI personas for contextual responses"""
     
     def __init__(self):
         self.default_persona = "ashoka"
-        self.personas_dir = Path(__file__).parent / "prompts" / "personas"
-        self.base_persona_file = Path(__file__).parent / "prompts" / "persona.txt"
+        self.personas_dir = _MODULE_DIR / "prompts" / "personas"
+        self.base_persona_file = _MODULE_DIR / "prompts" / "persona.txt"
         self._persona_cache = {}
         self._load_personas()
     
@@ -37,12 +44,37 @@ class PersonaManager:
         """Get list of available persona names"""
         return [name for name in self._persona_cache.keys() if name != 'base']
     
+    def list_available_personas(self):
+        """
+        List available personas with a short description of each
+        Built from the in-memory cache, so listing never touches the disk
+        """
+        personas = []
+        for name in self.get_available_personas():
+            content = self._persona_cache[name]
+            first_line = content.split('\n', 1)[0]
+            personas.append({
+                'name': name,
+                'description': first_line.lstrip('#').strip(),
+                'is_default': name == self.default_persona,
+                'word_count': len(content.split())
+            })
+        return personas
+    
     def get_persona_content(self, persona_name):
         """Get the content for a specific persona"""
         if not persona_name or persona_name not in self._persona_cache:
             return None
         return self._persona_cache[persona_name]
     
+    def load_persona(self, persona_name):
+        """
+        Load a persona's content
+        Served from the in-memory cache with no disk access; edits on disk are
+        picked up by reload_personas()
+        """
+        return self.get_persona_content(persona_name)
+    
     def get_persona_or_default(self, persona_name=None):
         """
         Get persona content with fallback to default
@@ -72,10 +104,70 @@ class PersonaManager:
         
         return persona_name, persona_content
     
+    def validate_persona(self, persona_name):
+        """
+        Check a persona's content for common problems
+        Returns dict with 'valid', 'warnings' and 'stats' (character, word and line counts)
+        """
+        content = self.get_persona_content(persona_name)
+        if content is None:
+            return {
+                'valid': False,
+                'warnings': [f"Persona '{persona_name}' not found"],
+                'stats': {'character_count': 0, 'word_count': 0, 'line_count': 0}
+            }
+        
+        lines = content.split('\n')
+        warnings = []
+        if len(content) < 100:
+            warnings.append("Persona content is very short")
+        if not any(line.lstrip().startswith(("You are", "#")) for line in lines[:5] if line):
+            warnings.append("Persona should open with a role statement ('You are ...') or a heading")
+        
+        return {
+            'valid': bool(content.strip()),
+            'warnings': warnings,
+            'stats': {
+                'character_count': len(content),
+                'word_count': len(content.split()),
+                'line_count': len(lines)
+            }
+        }
+    
     def persona_exists(self, persona_name):
         """Check if a persona exists"""
         return persona_name in self._persona_cache
     
+    def create_persona(self, persona_name, content):
+        """
+        Create or overwrite a persona on disk and in the cache
+        Returns False for an invalid name or empty content
+        """
+        content = (content or '').strip()
+        if not persona_name or not VALID_PERSONA_NAME.fullmatch(persona_name) or persona_name == 'base' or not content:
+            return False
+        
+        self.personas_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.personas_dir / f"{persona_name}.txt", 'w', encoding='utf-8') as f:
+            f.write(content + '\n')
+        self._persona_cache[persona_name] = content
+        return True
+    
+    def delete_persona(self, persona_name):
+        """
+        Delete a persona from disk and the cache
+        Returns False if it does not exist or is the default persona
+        """
+        if (persona_name == self.default_persona or not self.persona_exists(persona_name)
+                or persona_name == 'base' or not VALID_PERSONA_NAME.fullmatch(persona_name)):
+            return False
+        
+        persona_file = self.personas_dir / f"{persona_name}.txt"
+        if persona_file.exists():
+            persona_file.unlink()
+        del self._persona_cache[persona_name]
+        return True
+    
     def reload_personas(self):
         """Reload all personas from disk"""
         self._persona_cache.clear()
@@ -12,12 +12,42 @@ import os
 import sys
 import time
 import json
+import random
+import re
 import argparse
 import traceback
 import runpod
-import requests
 from pathlib import Path
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, Any
+
+
+# Pod desiredStatus groups used by the start/stop state machine
+RUNNING_STATUSES = frozenset({'RUNNING'})
+STOPPED_STATUSES = frozenset({'EXITED', 'STOPPED'})
+# Pseudo-statuses get_pod_status reports when a pod can't be queried
+UNAVAILABLE_STATUSES = frozenset({'NOT_FOUND', 'Error'})
+
+# Parsed env files keyed by (path, mtime_ns, size), so repeat PodManager
+# constructions skip the re-read until the file changes
+_CONFIG_CACHE: Dict[tuple, Dict[str, str]] = {}
+
+# KEY=VALUE lines, optionally prefixed with 'export'. Like the original
+# line-by-line parser, keys and values are whitespace-stripped, values keep any
+# quotes verbatim, and '#' comment and blank lines never match.
+_ENV_LINE = re.compile(r'^[ \t]*(?:export[ \t]+)?([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+
+def _read_env_file(env_file: Path) -> Dict[str, str]:
+    """Parse KEY=VALUE lines from an env file, memoized on the file's mtime and size"""
+    st = env_file.stat()
+    cache_key = (str(env_file), st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    parsed = dict(_ENV_LINE.findall(env_file.read_text()))
+    _CONFIG_CACHE[cache_key] = parsed
+    return parsed
 
 
 class PodManager:
@@ -28,23 +58,47 @@ class PodManager:
         self.min_gpu_price = min_gpu_price
         self.gpu_count = gpu_count
         self.api_key = self._get_api_key()
-        self.config = self._load_config()
+        # desiredStatus by pod ID from the most recent pod listing
+        self._listed_statuses: Dict[str, str] = {}
+        # Resolved Ashoka API base URL per pod type
+        self._api_urls: Dict[str, str] = {}
+        # Loaded on first use, so status/stop never read or validate the env file
+        self._config = None
         
         # Initialize RunPod SDK
         runpod.api_key = self.api_key
+        self._session = None
+        
+    @property
+    def config(self) -> Dict[str, str]:
+        """Configuration from the env file plus defaults and command line overrides"""
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+    
+    @property
+    def session(self):
+        """Keep-alive session for the Ashoka API helpers, built on first use
         
+        requests is imported here so pod start/stop/status never load it.
+        Idempotent requests are retried on gateway errors while a pod is coming up.
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4,
+                                  max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]))
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
+        return self._session
+    
     def _load_config(self) -> Dict[str, str]:
         """Load configuration from env file"""
         env_file = self.script_dir / "env"
-        config = {}
-        
-        if env_file.exists():
-            with open(env_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        config[key.strip()] = value.strip()
+        # Copy so the defaults and command line overrides below never touch the cached parse
+        config = dict(_read_env_file(env_file)) if env_file.exists() else {}
         
         # Set basic defaults
         config.setdefault('MAX_GPU_PRICE', '0.30')
@@ -92,8 +146,9 @@ class PodManager:
         If raise_on_error is True, raises exceptions instead of returning (None, None) on API errors.
         """
         try:
-            # Get all pods
+            # Get all pods, keeping their statuses so callers can skip a separate status query
             pods = runpod.get_pods()
+            self._listed_statuses = {pod['id']: pod.get('desiredStatus', 'UNKNOWN') for pod in pods if pod.get('id')}
             if self.verbose:
                 self._print(f"🔍 Found {len(pods)} total pods")
             
@@ -138,17 +193,13 @@ class PodManager:
     def get_pod_status(self, pod_id: str) -> str:
         """Get the current status of a pod using RunPod SDK"""
         try:
-            pods = runpod.get_pods()
-            if self.verbose:
-                self._print(f"🔍 Found {len(pods)} total pods")
-            
-            # Find the specific pod
-            for pod in pods:
-                if pod['id'] == pod_id:
-                    status = pod.get('desiredStatus', 'UNKNOWN')
-                    if self.verbose:
-                        self._print(f"Pod {pod_id} status: {status}")
-                    return status
+            # Query just this pod rather than listing every pod on the account
+            pod = runpod.get_pod(pod_id)
+            if pod:
+                status = pod.get('desiredStatus', 'UNKNOWN')
+                if self.verbose:
+                    self._print(f"Pod {pod_id} status: {status}")
+                return status
             
             self._print(f"❌ Pod {pod_id} not found", force=True)
             return 'NOT_FOUND'
@@ -158,80 +209,119 @@ class PodManager:
             traceback.print_exc()
             return 'Error'
     
-    def wait_for_status(self, pod_id: str, target_statuses: list, timeout: int = 300) -> bool:
-        """Wait for pod to reach one of the target statuses"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+    def get_all_pod_statuses(self) -> Dict[str, str]:
+        """Get the status of every pod on the account with a single listing call"""
+        try:
+            pods = runpod.get_pods()
+            self._listed_statuses = {pod['id']: pod.get('desiredStatus', 'UNKNOWN') for pod in pods if pod.get('id')}
+            return dict(self._listed_statuses)
+        except Exception as e:
+            self._print(f"❌ Failed to list pod statuses: {e}", force=True)
+            traceback.print_exc()
+            return {}
+    
+    def _current_status(self, pod_id: str) -> str:
+        """Status from the pod listing that just located the pod, else a fresh query"""
+        return self._listed_statuses.get(pod_id) or self.get_pod_status(pod_id)
+    
+    def wait_for_status(self, pod_id: str, target_statuses: list, timeout: int = 300,
+                        base_delay: float = 1.0, max_delay: float = 30.0) -> bool:
+        """Wait for pod to reach one of the target statuses
+        
+        Polls with exponential backoff and full jitter (a random sleep up to
+        min(max_delay, base_delay * 2**attempt)), so long transitions make few
+        API calls and concurrent callers don't poll in lockstep.
+        """
+        return self._await_status(pod_id, target_statuses, timeout=timeout,
+                                  base_delay=base_delay, max_delay=max_delay) is not None
+    
+    def _await_status(self, pod_id: str, target_statuses: list, command_result: Any = None,
+                      timeout: int = 300, base_delay: float = 1.0, max_delay: float = 30.0) -> Optional[str]:
+        """Return the target status the pod reached, or None on error or timeout
+        
+        If the SDK's resume/stop result already reports a target status, no
+        status query is made.
+        """
+        if isinstance(command_result, dict) and command_result.get('desiredStatus') in target_statuses:
+            return command_result['desiredStatus']
+        
+        # Monotonic deadline so wall-clock adjustments can't cut the wait short or stretch it
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while time.monotonic() < deadline:
             current_status = self.get_pod_status(pod_id)
             if current_status in target_statuses:
-                return True
-            if current_status in ['Error', 'NOT_FOUND']:
-                return False
+                return current_status
+            if current_status in UNAVAILABLE_STATUSES:
+                return None
             
             if self.verbose:
                 self._print(f"Waiting for pod status... Current: {current_status}")
-            time.sleep(5)
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            attempt += 1
         
-        return False
+        return None
     
-    def start_pod(self, pod_type: str, deploy_new_if_needed: bool = False) -> bool:
-        """Start a pod using RunPod SDK"""
-        self._print(f"Starting {pod_type} pod...")
-        
-        # Find existing pod by name pattern
-        pod_id, pod_url = self._find_pod_by_type(pod_type)
-        
-        if not pod_id:
-            self._print(f"❌ No {pod_type} pod found")
-            if deploy_new_if_needed:
-                self._print("Pod not found, attempting to deploy a new pod...")
-                return self.deploy_pod(pod_type)
-            else:
-                return False
+    def _transition_pod(self, pod_id: str, pod_url: str, action: str, action_ing: str, state: str,
+                        target_statuses: frozenset, send_command) -> str:
+        """Drive a located pod to one of target_statuses
         
+        Returns the target status reached (or already held), the status that
+        made the pod unusable ('NOT_FOUND' or 'Error'), or None if the command
+        was sent but the pod never got there. Errors from send_command propagate.
+        """
         self._print(f"Pod ID: {pod_id}")
         self._print(f"Server Host: {pod_url}")
         
         # Check current status
-        current_status = self.get_pod_status(pod_id)
+        current_status = self._current_status(pod_id)
         self._print(f"Current status: {current_status}")
         
-        if current_status == "RUNNING":
-            self._print("✅ Pod is already running. No action needed.")
+        if current_status in target_statuses:
+            self._print(f"✅ Pod is already {state}. No action needed.")
             if not self.verbose:
-                print("RUNNING")
-            return True
+                print(current_status)
+            return current_status
+        
+        if current_status in UNAVAILABLE_STATUSES:
+            return current_status
+        
+        # Send the command using RunPod SDK
+        self._print(f"{action_ing} pod {pod_id}...")
+        result = send_command()
+        if self.verbose:
+            self._print(f"🔍 {action.title()} result: {result}")
         
-        if current_status in ['NOT_FOUND', 'Error']:
+        self._print(f"{action.title()} command sent. Waiting for pod to {action}...")
+        
+        final_status = self._await_status(pod_id, target_statuses, result)
+        if final_status:
+            self._print(f"✅ Pod is now {state} successfully!")
+            if not self.verbose:
+                print(final_status)
+        return final_status
+    
+    def start_pod(self, pod_type: str, deploy_new_if_needed: bool = False) -> bool:
+        """Start a pod using RunPod SDK"""
+        self._print(f"Starting {pod_type} pod...")
+        
+        # Find existing pod by name pattern
+        pod_id, pod_url = self._find_pod_by_type(pod_type)
+        
+        if not pod_id:
+            self._print(f"❌ No {pod_type} pod found")
             if deploy_new_if_needed:
                 self._print("Pod not found, attempting to deploy a new pod...")
                 return self.deploy_pod(pod_type)
             else:
-                self._print("❌ Pod not found and deploy_new_if_needed is False", force=True)
                 return False
         
-        # Start the pod using RunPod SDK
-        self._print(f"Starting pod {pod_id}...")
+        gpu_count = int(self.config.get('GPU_COUNT', '1'))
         try:
-            gpu_count = int(self.config.get('GPU_COUNT', '1'))
-            result = runpod.resume_pod(pod_id=pod_id, gpu_count=gpu_count)
-            if self.verbose:
-                self._print(f"🔍 Start result: {result}")
-            
-            self._print("Start command sent. Waiting for pod to start...")
-            
-            if self.wait_for_status(pod_id, ["RUNNING"]):
-                self._print("✅ Pod is now running successfully!")
-                if not self.verbose:
-                    print("RUNNING")
-                return True
-            else:
-                self._print("❌ Pod failed to start", force=True)
-                if deploy_new_if_needed:
-                    self._print("Pod failed to start, attempting to deploy a new pod...")
-                    return self.deploy_pod(pod_type)
-                return False
-                
+            status = self._transition_pod(
+                pod_id, pod_url, "start", "Starting", "running", RUNNING_STATUSES,
+                lambda: runpod.resume_pod(pod_id=pod_id, gpu_count=gpu_count))
         except Exception as e:
             self._print(f"❌ Start failed: {e}", force=True)
             traceback.print_exc()
@@ -240,6 +330,22 @@ class PodManager:
                 self.terminate_pod(pod_type)
                 return self.deploy_pod(pod_type)
             return False
+        
+        if status in RUNNING_STATUSES:
+            return True
+        
+        if status in UNAVAILABLE_STATUSES:
+            if deploy_new_if_needed:
+                self._print("Pod not found, attempting to deploy a new pod...")
+                return self.deploy_pod(pod_type)
+            self._print("❌ Pod not found and deploy_new_if_needed is False", force=True)
+            return False
+        
+        self._print("❌ Pod failed to start", force=True)
+        if deploy_new_if_needed:
+            self._print("Pod failed to start, attempting to deploy a new pod...")
+            return self.deploy_pod(pod_type)
+        return False
     
     def stop_pod(self, pod_type: str) -> bool:
         """Stop a pod using RunPod SDK"""
@@ -257,46 +363,23 @@ class PodManager:
             self._print(f"❌ No {pod_type} pod found. No action needed.")
             return True
         
-        self._print(f"Pod ID: {pod_id}")
-        self._print(f"Server Host: {pod_url}")
-        
-        # Check current status
-        current_status = self.get_pod_status(pod_id)
-        self._print(f"Current status: {current_status}")
-        
-        if current_status in ["EXITED", "STOPPED"]:
-            self._print("✅ Pod is already stopped. No action needed.")
-            if not self.verbose:
-                print(current_status)
-            return True
-        
-        if current_status in ['NOT_FOUND', 'Error']:
-            self._print("❌ Pod not found or error getting status", force=True)
-            return False
-        
-        # Stop the pod using RunPod SDK
-        self._print(f"Stopping pod {pod_id}...")
         try:
-            result = runpod.stop_pod(pod_id)
-            if self.verbose:
-                self._print(f"🔍 Stop result: {result}")
-            
-            self._print("Stop command sent. Waiting for pod to stop...")
-            
-            if self.wait_for_status(pod_id, ["EXITED", "STOPPED"]):
-                final_status = self.get_pod_status(pod_id)
-                self._print("✅ Pod is now stopped successfully!")
-                if not self.verbose:
-                    print(final_status)
-                return True
-            else:
-                self._print("❌ Pod failed to stop", force=True)
-                return False
-                
+            status = self._transition_pod(
+                pod_id, pod_url, "stop", "Stopping", "stopped", STOPPED_STATUSES,
+                lambda: runpod.stop_pod(pod_id))
         except Exception as e:
             self._print(f"❌ Stop failed: {e}", force=True)
             traceback.print_exc()
             return False
+        
+        if status in STOPPED_STATUSES:
+            return True
+        
+        if status in UNAVAILABLE_STATUSES:
+            self._print("❌ Pod not found or error getting status", force=True)
+        else:
+            self._print("❌ Pod failed to stop", force=True)
+        return False
     
     def restart_pod(self, pod_type: str, deploy_new_if_needed: bool = False) -> bool:
         """Restart a pod (stop then start)"""
@@ -325,7 +408,7 @@ class PodManager:
         print(f"POD_ID={pod_id}")
         print(f"POD_URL={pod_url}")
         
-        status = self.get_pod_status(pod_id)
+        status = self._current_status(pod_id)
         print(f"POD_STATUS={status}")
         
         return True
@@ -534,20 +617,28 @@ class PodManager:
             return False
     
     def _get_api_url(self, pod_type: str) -> str:
-        """Get the API URL for the specified pod type"""
+        """Get the API URL for the specified pod type, resolved once per pod type"""
+        cached = self._api_urls.get(pod_type)
+        if cached:
+            return cached
+        
         # Check for configured API URL (e.g., Cloudflare tunnel)
         configured_url = self.config.get('API_URL')
         if configured_url:
-            return configured_url.rstrip('/')
-        
-        # Fall back to dynamic pod discovery
-        pod_url = self._get_pod_url(pod_type)
-        if not pod_url:
-            return None
-        return f"https://{pod_url}"
+            api_url = configured_url.rstrip('/')
+        else:
+            # Fall back to dynamic pod discovery
+            pod_url = self._get_pod_url(pod_type)
+            if not pod_url:
+                return None
+            api_url = f"https://{pod_url}"
+        
+        self._api_urls[pod_type] = api_url
+        return api_url
     
     def ask_api(self, pod_type: str, question: str, persona: str = None, realm_status: dict = None) -> bool:
         """Ask a question to the Ashoka API"""
+        import requests
         api_url = self._get_api_url(pod_type)
         if not api_url:
             self._print(f"❌ No {pod_type} pod found or not running", force=True)
@@ -566,7 +657,7 @@ class PodManager:
             if persona:
                 self._print(f"👤 Using persona: {persona}")
             
-            response = requests.post(endpoint, json=payload, timeout=30)
+            response = self.session.post(endpoint, json=payload, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -588,6 +679,7 @@ class PodManager:
     
     def list_personas_api(self, pod_type: str) -> bool:
         """List all available personas from the API"""
+        import requests
         api_url = self._get_api_url(pod_type)
         if not api_url:
             self._print(f"❌ No {pod_type} pod found or not running", force=True)
@@ -596,7 +688,7 @@ class PodManager:
         endpoint = f"{api_url}/api/personas"
         
         try:
-            response = requests.get(endpoint, timeout=10)
+            response = self.session.get(endpoint, timeout=10)
             response.raise_for_status()
             
             result = response.json()
@@ -620,6 +712,7 @@ class PodManager:
     
     def get_persona_api(self, pod_type: str, persona_name: str) -> bool:
         """Get details for a specific persona from the API"""
+        import requests
         api_url = self._get_api_url(pod_type)
         if not api_url:
             self._print(f"❌ No {pod_type} pod found or not running", force=True)
@@ -628,7 +721,7 @@ class PodManager:
         endpoint = f"{api_url}/api/personas/{persona_name}"
         
         try:
-            response = requests.get(endpoint, timeout=10)
+            response = self.session.get(endpoint, timeout=10)
             response.raise_for_status()
             
             result = response.json()
@@ -654,6 +747,7 @@ class PodManager:
     
     def get_realm_status_api(self, pod_type: str, realm_principal: str = None) -> bool:
         """Get realm status from the API"""
+        import requests
         api_url = self._get_api_url(pod_type)
         if not api_url:
             self._print(f"❌ No {pod_type} pod found or not running", force=True)
@@ -665,7 +759,7 @@ class PodManager:
             endpoint = f"{api_url}/api/realm-status/all"
         
         try:
-            response = requests.get(endpoint, timeout=10)
+            response = self.session.get(endpoint, timeout=10)
             response.raise_for_status()
             
             result = response.json()
@@ -697,13 +791,14 @@ class PodManager:
     
     def health_check_api(self, pod_type: str) -> bool:
         """Check API health status"""
+        import requests
         api_url = self._get_api_url(pod_type)
         if not api_url:
             self._print(f"❌ No {pod_type} pod found or not running", force=True)
             return False
         
         try:
-            response = requests.get(api_url, timeout=10)
+            response = self.session.get(api_url, timeout=10)
             response.raise_for_status()
             
             result = response.json()
@@ -13,6 +13,8 @@ from database.db_client import DatabaseClient
 
 logger = logging.getLogger(__name__)
 
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class RealmStatusScheduler:
     def __init__(self, db_client: DatabaseClient = None):
         self.db_client = db_client or DatabaseClient()
@@ -40,7 +42,7 @@ class RealmStatusScheduler:
                 return
             
             # Try to load from config file
-            config_file = os.path.join(os.path.dirname(__file__), 'realms_config.json')
+            config_file = os.path.join(_MODULE_DIR, 'realms_config.json')
             if os.path.exists(config_file):
                 with open(config_file, 'r') as f:
                     self.realms_config = json.load(f)
@@ -170,7 +172,7 @@ class RealmStatusScheduler:
     def save_realms_config(self):
         """Save the current realms configuration to file"""
         try:
-            config_file = os.path.join(os.path.dirname(__file__), 'realms_config.json')
+            config_file = os.path.join(_MODULE_DIR, 'realms_config.json')
             with open(config_file, 'w') as f:
                 json.dump(self.realms_config, f, indent=2)
             logger.info("Saved realms configuration to file")
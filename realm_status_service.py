@@ -6,7 +6,7 @@ import json
 import logging
 import os
 import subprocess
-import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from database.db_client import DatabaseClient
 
@@ -15,7 +15,23 @@ logger = logging.getLogger(__name__)
 class RealmStatusService:
     def __init__(self, db_client: DatabaseClient = None):
         self.db_client = db_client or DatabaseClient()
+        # Per-network DFX environment, built once and reused across calls
+        self._dfx_env_cache = {}
+        # Maximum number of concurrent DFX calls when fetching multiple realms
+        self.fetch_workers = max(1, int(os.getenv('REALM_STATUS_FETCH_WORKERS', '4')))
         
+    def _dfx_env(self, network: str) -> Dict[str, str]:
+        """Get the environment for DFX calls on the given network"""
+        env = self._dfx_env_cache.get(network)
+        if env is None:
+            # Set environment variables for DFX security warnings
+            env = os.environ.copy()
+            if network == 'ic':
+                # Suppress mainnet plaintext identity warning for read-only operations
+                env['DFX_WARNING'] = '-mainnet_plaintext_identity'
+            self._dfx_env_cache[network] = env
+        return env
+    
     def fetch_realm_status_via_dfx(self, realm_principal: str, realm_url: str = None, network: str = 'ic') -> Optional[Dict]:
         """
         Fetch realm status using DFX canister call with JSON output
@@ -31,12 +47,6 @@ class RealmStatusService:
         try:
             logger.info(f"Fetching realm status via DFX for {realm_principal} on network {network}")
             
-            # Set environment variables for DFX security warnings
-            env = os.environ.copy()
-            if network == 'ic':
-                # Suppress mainnet plaintext identity warning for read-only operations
-                env['DFX_WARNING'] = '-mainnet_plaintext_identity'
-            
             # Run DFX canister call command with JSON output
             cmd = [
                 'dfx', 'canister', 'call',
@@ -51,7 +61,7 @@ class RealmStatusService:
                 capture_output=True,
                 text=True,
                 timeout=30,
-                env=env
+                env=self._dfx_env(network)
             )
             
             if result.returncode != 0:
@@ -65,7 +75,7 @@ class RealmStatusService:
                 return response_data
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse JSON response from {realm_principal}: {e}")
-                logger.debug(f"Raw DFX output: {result.stdout}")
+                logger.debug("Raw DFX output: %s", result.stdout)
                 return None
             
         except subprocess.TimeoutExpired:
@@ -84,7 +94,15 @@ class RealmStatusService:
             
             # Use DFX to fetch status data
             raw_status_data = self.fetch_realm_status_via_dfx(realm_principal, realm_url, network)
+            return self._store_fetched_status(realm_principal, realm_url, raw_status_data)
             
+        except Exception as e:
+            logger.error(f"Error fetching and storing realm status: {e}")
+            return False
+    
+    def _store_fetched_status(self, realm_principal: str, realm_url: Optional[str], raw_status_data: Optional[Dict]) -> bool:
+        """Store status data previously fetched via DFX"""
+        try:
             if not raw_status_data:
                 logger.error(f"Failed to fetch status data for realm {realm_principal}")
                 return False
@@ -111,23 +129,36 @@ class RealmStatusService:
             return False
     
     def fetch_multiple_realms_status(self, realms: List[Dict[str, str]], network: str = "ic") -> Dict[str, bool]:
-        """Fetch status for multiple realms using DFX"""
+        """Fetch status for multiple realms using DFX
+        
+        The DFX calls run concurrently (bounded by REALM_STATUS_FETCH_WORKERS);
+        results are stored sequentially so database writes stay on this thread.
+        """
         results = {}
+        valid_realms = []
         
         for realm in realms:
             realm_principal = realm.get('principal')
-            realm_url = realm.get('url')
             
             if not realm_principal:
                 logger.warning(f"Invalid realm configuration - missing principal: {realm}")
                 results[realm_principal or 'unknown'] = False
                 continue
             
-            success = self.fetch_and_store_realm_status(realm_principal, realm_url, network)
-            results[realm_principal] = success
+            valid_realms.append((realm_principal, realm.get('url')))
+        
+        if not valid_realms:
+            return results
+        
+        max_workers = min(self.fetch_workers, len(valid_realms))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (realm_principal, realm_url, executor.submit(self.fetch_realm_status_via_dfx, realm_principal, realm_url, network))
+                for realm_principal, realm_url in valid_realms
+            ]
             
-            # Add small delay between requests to be respectful
-            time.sleep(1)
+            for realm_principal, realm_url, future in futures:
+                results[realm_principal] = self._store_fetched_status(realm_principal, realm_url, future.result())
         
         return results
     
@@ -143,19 +174,27 @@ class RealmStatusService:
     
     def get_realm_status_summary(self, realm_principal: str) -> Optional[Dict]:
         """Get a summary of the latest realm status"""
+        return self.summarize_status(self.db_client.get_latest_realm_status(realm_principal))
+    
+    def summarize_status(self, latest_status: Optional[Dict]) -> Optional[Dict]:
+        """Build the realm status summary from an already fetched realm_status row
+        
+        created_at may be a datetime or, for rows from DatabaseClient.get_context,
+        an ISO string.
+        """
         try:
-            latest_status = self.db_client.get_latest_realm_status(realm_principal)
             if not latest_status:
                 return None
             
             status_data = latest_status['status_data']
             metrics = self._extract_metrics(status_data)
+            created_at = latest_status['created_at']
             
             # Create a summary with key metrics
             summary = {
                 'realm_principal': latest_status['realm_principal'],
                 'realm_url': latest_status['realm_url'],
-                'last_updated': latest_status['created_at'].isoformat() if latest_status['created_at'] else None,
+                'last_updated': created_at.isoformat() if hasattr(created_at, 'isoformat') else created_at,
                 'status_data': status_data,
                 'metrics': metrics,  # Flattened metrics for easy access
                 'health_score': self._calculate_health_score(metrics)
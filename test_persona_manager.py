@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Tests for PersonaManager persona name validation
+"""
+from persona_manager import PersonaManager
+
+
+def make_manager(tmp_path):
+    manager = PersonaManager()
+    manager.personas_dir = tmp_path
+    return manager
+
+
+def test_create_persona_accepts_valid_name(tmp_path):
+    manager = make_manager(tmp_path)
+    assert manager.create_persona('my_persona-1', 'You are helpful.')
+    assert (tmp_path / 'my_persona-1.txt').exists()
+    assert manager.delete_persona('my_persona-1')
+    assert not (tmp_path / 'my_persona-1.txt').exists()
+
+
+def test_create_persona_rejects_trailing_newline(tmp_path):
+    manager = make_manager(tmp_path)
+    assert not manager.create_persona('abc\n', 'You are helpful.')
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_create_persona_rejects_path_separators(tmp_path):
+    manager = make_manager(tmp_path)
+    assert not manager.create_persona('../abc', 'You are helpful.')
+    assert not manager.create_persona('base', 'You are helpful.')
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Tests for pod_manager env file parsing
+"""
+from pod_manager import _read_env_file
+
+
+def test_read_env_file_syntaxes(tmp_path):
+    env_file = tmp_path / "env"
+    env_file.write_text(
+        "# RunPod Configuration\n"
+        "\n"
+        "NETWORK_VOLUME_ID=g7gp3yh8jt\n"
+        "  MAX_GPU_PRICE = 0.30  \n"
+        "export TEMPLATE_ID=ashoka1\n"
+        "IMAGE_NAME_BASE=\"docker.io/smartsocialcontracts/ashoka\"\n"
+        "API_URL=https://example.com/?a=b\n"
+        "  # GPU_COUNT=4\n"
+        "#MIN_GPU_PRICE=0.01\n"
+        "not a setting\n"
+        "CONTAINER_DISK=20\r\n"
+    )
+    assert _read_env_file(env_file) == {
+        'NETWORK_VOLUME_ID': 'g7gp3yh8jt',
+        'MAX_GPU_PRICE': '0.30',
+        'TEMPLATE_ID': 'ashoka1',
+        'IMAGE_NAME_BASE': '"docker.io/smartsocialcontracts/ashoka"',
+        'API_URL': 'https://example.com/?a=b',
+        'CONTAINER_DISK': '20',
+    }
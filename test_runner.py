@@ -10,18 +10,20 @@ Test cases are fetched dynamically from GitHub to allow updates without rebuildi
 """
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import warnings
 import os
+import sys
 import glob
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
 os.environ['TOKENIZERS_PARALLELISM'] = 'false'
 
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
 # GitHub repo configuration for dynamic test fetching
@@ -30,6 +32,13 @@ GITHUB_BRANCH = "main"
 GITHUB_TESTS_PATH = "tests"
 GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{GITHUB_TESTS_PATH}?ref={GITHUB_BRANCH}"
 GITHUB_RAW_URL = f"https://raw.githubusercontent.com/{GITHUB_REPO}/{GITHUB_BRANCH}/{GITHUB_TESTS_PATH}"
+GITHUB_FETCH_WORKERS = 8
+
+# Shared HTTP session so the API and GitHub calls reuse keep-alive connections
+http_session = requests.Session()
+http_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+http_session.mount('http://', http_adapter)
+http_session.mount('https://', http_adapter)
 
 # Load semantic similarity model
 print("Loading semantic similarity model...")
@@ -50,7 +59,7 @@ def fetch_tests_from_github():
     
     try:
         # Get list of files in tests directory
-        response = requests.get(GITHUB_API_URL, timeout=30)
+        response = http_session.get(GITHUB_API_URL, timeout=30)
         response.raise_for_status()
         files = response.json()
         
@@ -58,20 +67,22 @@ def fetch_tests_from_github():
         json_files = [f for f in files if f['name'].endswith('.json')]
         print(f"   Found {len(json_files)} test files")
         
-        # Fetch each test file
-        for file_info in sorted(json_files, key=lambda x: x['name']):
-            file_name = file_info['name']
-            raw_url = f"{GITHUB_RAW_URL}/{file_name}"
-            
-            try:
-                file_response = requests.get(raw_url, timeout=30)
-                file_response.raise_for_status()
-                test_case = file_response.json()
-                test_cases.append(test_case)
-                print(f"   ✓ Loaded: {file_name}")
-            except Exception as e:
-                print(f"   ✗ Failed to load {file_name}: {e}")
-                traceback.print_exc()
+        def fetch_test_file(file_name):
+            file_response = http_session.get(f"{GITHUB_RAW_URL}/{file_name}", timeout=30)
+            file_response.raise_for_status()
+            return file_response.json()
+        
+        # Fetch the test files concurrently, then report in name order
+        file_names = sorted(f['name'] for f in json_files)
+        with ThreadPoolExecutor(max_workers=GITHUB_FETCH_WORKERS) as executor:
+            futures = [executor.submit(fetch_test_file, file_name) for file_name in file_names]
+            for file_name, future in zip(file_names, futures):
+                try:
+                    test_cases.append(future.result())
+                    print(f"   ✓ Loaded: {file_name}")
+                except Exception as e:
+                    print(f"   ✗ Failed to load {file_name}: {e}")
+                    traceback.print_exc()
         
         print(f"✅ Loaded {len(test_cases)} tests from GitHub")
         return test_cases
@@ -121,7 +132,7 @@ def ask_ashoka(question, realm_status=None, api_url="http://localhost:5000/api/a
         if realm_status:
             payload["realm_status"] = realm_status
             
-        response = requests.post(api_url, json=payload, timeout=60)  # Increased timeout
+        response = http_session.post(api_url, json=payload, timeout=60)  # Increased timeout
         
         if response.status_code == 200:
             answer = response.json().get('answer', '')
@@ -148,7 +159,7 @@ def ask_ashoka_with_tools(question, realm_folder, network="local", api_url="http
             "network": network
         }
             
-        response = requests.post(api_url, json=payload, timeout=120)  # Longer timeout for tool calls
+        response = http_session.post(api_url, json=payload, timeout=120)  # Longer timeout for tool calls
         
         if response.status_code == 200:
             result = response.json()
@@ -166,13 +177,25 @@ def ask_ashoka_with_tools(question, realm_folder, network="local", api_url="http
         traceback.print_exc()
         return error_msg
 
-def semantic_similarity(text1, text2):
-    """Calculate semantic similarity between two texts"""
-    embeddings = model.encode([text1, text2])
-    similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-    return float(similarity)
+def semantic_similarities(actual_answers, expected_answers):
+    """Calculate pairwise semantic similarity for two equal-length lists of texts.
 
-def run_tests(tests_dir="tests", use_tools=False, realm_folder=None, network="local", fetch_from_github=True):
+    Each distinct text is encoded once in a single batch and the cosine
+    similarities are computed as row-wise dot products of the normalized
+    embeddings.
+    """
+    if not actual_answers:
+        return []
+    texts = list(actual_answers) + list(expected_answers)
+    unique_texts = list(dict.fromkeys(texts))
+    index = {text: i for i, text in enumerate(unique_texts)}
+    embeddings = model.encode(unique_texts, normalize_embeddings=True)
+    rows = np.array([index[text] for text in texts])
+    actual = embeddings[rows[:len(actual_answers)]]
+    expected = embeddings[rows[len(actual_answers):]]
+    return np.einsum('ij,ij->i', actual, expected).astype(float).tolist()
+
+def run_tests(tests_dir="tests", use_tools=False, realm_folder=None, network="local", fetch_from_github=True, workers=1):
     """Run all tests and return results"""
     print("Loading test cases...")
     all_test_cases = load_test_cases(tests_dir, fetch_from_github=fetch_from_github)
@@ -198,31 +221,47 @@ def run_tests(tests_dir="tests", use_tools=False, realm_folder=None, network="lo
         print(f"  Realm folder: {realm_folder}")
         print(f"  Network: {network}")
     
-    for i, test_case in enumerate(test_cases, 1):
+    if workers > 1:
+        print(f"  Workers: {workers}")
+    
+    def ask_test_case(i, test_case):
         test_name = test_case.get('name', f'test_{i}')
         user_prompt = test_case['user_prompt']
         print(f"\nTest {i}/{total_tests} ({test_name}): {user_prompt[:60]}...")
         
         # Ask Ashoka - use tools mode or legacy mode
         if use_tools:
-            actual_answer = ask_ashoka_with_tools(user_prompt, realm_folder, network)
-        else:
-            realm_status = test_case.get('realm_status')  # Extract realm context for legacy mode
-            actual_answer = ask_ashoka(user_prompt, realm_status)
-        
-        expected_answer = test_case['expected_answer']
-        
-        # Calculate semantic similarity
-        similarity = semantic_similarity(actual_answer, expected_answer)
-        
+            return ask_ashoka_with_tools(user_prompt, realm_folder, network)
+        realm_status = test_case.get('realm_status')  # Extract realm context for legacy mode
+        return ask_ashoka(user_prompt, realm_status)
+    
+    if workers > 1:
+        # Requests are independent, so overlap them across a bounded pool
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            answers = list(executor.map(ask_test_case, range(1, total_tests + 1), test_cases))
+    else:
+        answers = []
+        for i, test_case in enumerate(test_cases, 1):
+            answers.append(ask_test_case(i, test_case))
+            
+            # Small delay to avoid overwhelming the API
+            time.sleep(1)
+    
+    # Score all answers in one batch
+    print("\nCalculating semantic similarity...")
+    expected_answers = [test_case['expected_answer'] for test_case in test_cases]
+    similarities = semantic_similarities(answers, expected_answers)
+    
+    for i, (test_case, actual_answer, similarity) in enumerate(zip(test_cases, answers, similarities), 1):
+        test_name = test_case.get('name', f'test_{i}')
         threshold = test_case.get('semantic_threshold', 0.7)
         passed = similarity >= threshold
         
         result = {
             'test_id': i,
             'test_name': test_name,
-            'question': user_prompt,
-            'expected_answer': expected_answer,
+            'question': test_case['user_prompt'],
+            'expected_answer': test_case['expected_answer'],
             'actual_answer': actual_answer,
             'similarity_score': similarity,
             'threshold': threshold,
@@ -231,34 +270,41 @@ def run_tests(tests_dir="tests", use_tools=False, realm_folder=None, network="lo
         
         results.append(result)
         
-        print(f"Similarity: {similarity:.3f} (threshold: {threshold:.3f}) - {'PASS' if passed else 'FAIL'}")
-        
-        # Small delay to avoid overwhelming the API
-        time.sleep(1)
+        print(f"Test {i} ({test_name}) similarity: {similarity:.3f} (threshold: {threshold:.3f}) - {'PASS' if passed else 'FAIL'}")
     
     return results
 
 def print_summary(results):
     """Print test summary"""
+    # One pass over the results for the counts, the average and the failure list
     total = len(results)
-    passed = sum(1 for r in results if r['passed'])
-    failed = total - passed
-    avg_similarity = np.mean([r['similarity_score'] for r in results])
+    similarity_total = 0.0
+    failed_lines = []
+    for r in results:
+        similarity_total += r['similarity_score']
+        if not r['passed']:
+            failed_lines.append(f"- Test {r['test_id']}: {r['similarity_score']:.3f} - {r['question'][:60]}...")
+    failed = len(failed_lines)
+    passed = total - failed
+    avg_similarity = similarity_total / total
     
-    print(f"\n{'='*50}")
-    print(f"TEST SUMMARY")
-    print(f"{'='*50}")
-    print(f"Total Tests: {total}")
-    print(f"Passed: {passed}")
-    print(f"Failed: {failed}")
-    print(f"Pass Rate: {passed/total*100:.1f}%")
-    print(f"Average Similarity: {avg_similarity:.3f}")
+    # Build the report in memory and write it in one go
+    lines = [
+        f"\n{'='*50}",
+        "TEST SUMMARY",
+        f"{'='*50}",
+        f"Total Tests: {total}",
+        f"Passed: {passed}",
+        f"Failed: {failed}",
+        f"Pass Rate: {passed/total*100:.1f}%",
+        f"Average Similarity: {avg_similarity:.3f}",
+    ]
     
     if failed > 0:
-        print(f"\nFAILED TESTS:")
-        for r in results:
-            if not r['passed']:
-                print(f"- Test {r['test_id']}: {r['similarity_score']:.3f} - {r['question'][:60]}...")
+        lines.append("\nFAILED TESTS:")
+        lines.extend(failed_lines)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def save_results(results, output_file="test_results.json"):
     """Save detailed results to JSON file"""
@@ -266,6 +312,14 @@ def save_results(results, output_file="test_results.json"):
         json.dump(results, f, indent=2)
     print(f"\nDetailed results saved to: {output_file}")
 
+def default_workers():
+    """Worker count from $OLLAMA_NUM_PARALLEL, falling back to 1 if unset or not a number"""
+    try:
+        return max(1, int(os.getenv('OLLAMA_NUM_PARALLEL', '1')))
+    except ValueError:
+        return 1
+
+
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description='Ashoka CI Test Runner')
@@ -281,6 +335,9 @@ def parse_args():
                         help='Directory containing test JSON files')
     parser.add_argument('--local-tests', action='store_true',
                         help='Use local test files instead of fetching from GitHub')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help='Number of tests to run concurrently against the API '
+                             '(default: $OLLAMA_NUM_PARALLEL, or 1)')
     return parser.parse_args()
 
 
@@ -296,7 +353,8 @@ if __name__ == "__main__":
         use_tools=args.use_tools,
         realm_folder=args.realm_folder,
         network=args.network,
-        fetch_from_github=not args.local_tests
+        fetch_from_github=not args.local_tests,
+        workers=max(1, args.workers)
     )
     
     # Print summary